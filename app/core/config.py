@@ -1,46 +1,116 @@
+"""
+Core configuration and settings for the YouTube API Server
+"""
+import logging
 import os
-from dotenv import load_dotenv
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Tuple
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from the repository's .env file, whatever the
+# working directory (skip the import and parse when there is none)
+_ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+if _ENV_FILE.is_file():
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv(_ENV_FILE, override=False)
 
+# Single reference to the process environment, read once per setting below
+env = os.environ
+
+def _parse_log_level(name: str) -> int:
+    """Resolve a level name such as ``"INFO"`` to its numeric value (INFO if unknown)."""
+    level = logging.getLevelName(name.upper())
+    return level if isinstance(level, int) else logging.INFO
+
+def _parse_bool(value: str) -> bool:
+    """Parse a ``"true"``/``"false"`` environment value."""
+    return value.lower() == "true"
+
+def _parse_origins(value: str) -> Tuple[str, ...]:
+    """Parse comma-separated CORS origins into an immutable tuple of interned strings."""
+    return tuple(sys.intern(origin.strip()) for origin in (value or "*").split(","))
+
+def _env(name: str, default: str, cast: Callable[[str], Any] = str, secret: bool = False) -> Any:
+    """Dataclass field whose default is read from the environment when Settings is built.
+
+    Secret fields are left out of the repr so credentials don't end up in logs.
+    """
+    return field(default_factory=lambda: cast(env.get(name, default)), repr=not secret)
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """
     Application settings
     
-    Reads settings from environment variables or .env file
+    Reads settings from environment variables or .env file. The instance is
+    immutable and slot-backed; use :func:`get_settings` to obtain it.
     """
     # API settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "YouTube Tools API"
     
     # Server settings
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", "8000"))
+    HOST: str = _env("HOST", "0.0.0.0")
+    PORT: int = _env("PORT", "8000", int)
     
     # CORS settings - add specific origins in production
-    # Parse comma-separated origins from environment variable
-    BACKEND_CORS_ORIGINS: list = (
-        [origin.strip() for origin in os.getenv("BACKEND_CORS_ORIGINS", "*").split(",")]
-        if os.getenv("BACKEND_CORS_ORIGINS")
-        else ["*"]
-    )
+    BACKEND_CORS_ORIGINS: Tuple[str, ...] = _env("BACKEND_CORS_ORIGINS", "*", _parse_origins)
+    
+    # Debug mode - enables diagnostic endpoints such as /youtube/performance/test
+    DEBUG: bool = _env("DEBUG", "false", _parse_bool)
     
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = _env("LOG_LEVEL", "INFO")
+    LOG_LEVEL_INT: int = field(init=False)
     
     # Proxy settings for YouTube API (to work around IP blocking)
-    PROXY_TYPE: str = os.getenv("PROXY_TYPE", "")  # "generic" or "webshare"
-    PROXY_URL: str = os.getenv("PROXY_URL", "")  # For generic proxies
-    PROXY_HTTP: str = os.getenv("PROXY_HTTP", "")
-    PROXY_HTTPS: str = os.getenv("PROXY_HTTPS", "") 
-    WEBSHARE_USERNAME: str = os.getenv("WEBSHARE_USERNAME", "")
-    WEBSHARE_PASSWORD: str = os.getenv("WEBSHARE_PASSWORD", "")
+    # Unset values stay "" so callers can simply test truthiness
+    PROXY_TYPE: str = _env("PROXY_TYPE", "")  # "generic" or "webshare"
+    PROXY_URL: str = _env("PROXY_URL", "", secret=True)  # For generic proxies
+    PROXY_HTTP: str = _env("PROXY_HTTP", "", secret=True)
+    PROXY_HTTPS: str = _env("PROXY_HTTPS", "", secret=True)
+    WEBSHARE_USERNAME: str = _env("WEBSHARE_USERNAME", "")
+    WEBSHARE_PASSWORD: str = _env("WEBSHARE_PASSWORD", "", secret=True)
     
     # Cache settings for transcripts
-    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
-    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))  # Default: 1 hour
-    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "1000"))  # Maximum number of cached transcripts
+    CACHE_ENABLED: bool = _env("CACHE_ENABLED", "true", _parse_bool)
+    CACHE_TTL_SECONDS: int = _env("CACHE_TTL_SECONDS", "3600", int)  # Default: 1 hour
+    CACHE_MAX_SIZE: int = _env("CACHE_MAX_SIZE", "1000", int)  # Maximum number of cached transcripts
+    # Negative caching of failed fetches (0 disables)
+    CACHE_MISSING_TTL_SECONDS: int = _env("CACHE_MISSING_TTL_SECONDS", "3600", int)  # No captions / bad video
+    CACHE_ERROR_TTL_SECONDS: int = _env("CACHE_ERROR_TTL_SECONDS", "300", int)  # Other errors reported by YouTube
+    
+    # Shared Redis cache (second level behind the in-process cache); disabled when unset
+    REDIS_URL: str = _env("REDIS_URL", "", secret=True)
+    REDIS_TRANSCRIPT_TTL_SECONDS: int = _env("REDIS_TRANSCRIPT_TTL_SECONDS", "3600", int)  # Default: 1 hour
+    REDIS_OEMBED_TTL_SECONDS: int = _env("REDIS_OEMBED_TTL_SECONDS", "86400", int)  # Default: 24 hours
+    REDIS_TIMEOUT_SECONDS: float = _env("REDIS_TIMEOUT_SECONDS", "0.5", float)  # Connect and per-command timeout
+    
+    # Persistent on-disk transcript cache, used as second level when Redis is not configured
+    DISK_CACHE_DIR: str = _env("DISK_CACHE_DIR", "")  # Disabled when unset
+    DISK_CACHE_TTL_SECONDS: int = _env("DISK_CACHE_TTL_SECONDS", "604800", int)  # Default: 7 days
+    DISK_CACHE_SIZE_LIMIT: int = _env("DISK_CACHE_SIZE_LIMIT", str(10 * 2**30), int)  # Default: 10 GiB
+    
+    # Upper bound on threads running blocking transcript fetches
+    TRANSCRIPT_MAX_WORKERS: int = _env("TRANSCRIPT_MAX_WORKERS", "32", int)
+    # Maximum number of videos accepted by the bulk endpoints
+    BULK_MAX_VIDEOS: int = _env("BULK_MAX_VIDEOS", "20", int)
+    # How long idle connections to YouTube stay pooled (seconds)
+    HTTP_KEEPALIVE_SECONDS: float = _env("HTTP_KEEPALIVE_SECONDS", "300", float)
+
+    def __post_init__(self):
+        object.__setattr__(self, "LOG_LEVEL_INT", _parse_log_level(self.LOG_LEVEL))
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process and return the shared instance."""
+    return Settings()
 
-# Create settings instance
-settings = Settings()
\ No newline at end of file
+# Module-level instance, kept for existing ``from app.core.config import settings`` imports
+settings = get_settings()
@@ -1,22 +1,40 @@
 import logging
-import traceback
+from contextlib import asynccontextmanager
+from itertools import count
 
-from fastapi import FastAPI, Request, status
+import orjson
+from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from app.core.config import settings
+from app.core.config import get_settings
 from app.routes.youtube import router as youtube_router
 from app.routes.service import router as service_router
+from app.utils.disk_cache import disk_cache
+from app.utils.redis_cache import redis_cache
+from app.utils.youtube_tools import (
+    close_http_client,
+    get_transcript_executor,
+    shutdown_transcript_executor,
+)
+
+settings = get_settings()
 
-# Configure logging
+# Configure logging (no asctime: the platform log collector timestamps stdout,
+# and formatting the time per record is avoidable work under load)
 logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    level=settings.LOG_LEVEL_INT,
+    format="%(levelname)s - %(name)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+# Bound once so the error paths skip the attribute lookup on every call
+_log_error = logger.error
+_log_warning = logger.warning
+
+# Sequence for error IDs returned with 500 responses (unique per process)
+_err_seq = count()
 
 # Enrich Swagger-UI with nicer defaults
 swagger_ui_parameters = {
@@ -24,6 +42,18 @@ swagger_ui_parameters = {
     "defaultModelsExpandDepth": -1,  # hide schemas section unless expanded
 }
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    app.state.executor = get_transcript_executor()
+    yield
+    # Don't wait on in-flight YouTube requests when the server is stopping; the
+    # pool (like the clients below) is rebuilt if the app is started again
+    shutdown_transcript_executor()
+    await close_http_client()
+    await redis_cache.close()
+    disk_cache.close()
+
 # Custom API metadata (will be visible in /docs)
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -39,6 +69,7 @@ app = FastAPI(
         "url": "https://opensource.org/licenses/MIT",
     },
     swagger_ui_parameters=swagger_ui_parameters,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -46,8 +77,10 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (rather than "*") matching the registered routes, so
+    # Starlette serves preflights from its precomputed headers
+    allow_methods=["GET", "DELETE"],
+    allow_headers=["Accept", "Content-Type"],
 )
 
 # Global exception handler for unhandled exceptions
@@ -65,15 +98,14 @@ async def global_exception_handler(request: Request, exc: Exception):
     if isinstance(exc, HTTPException):
         raise exc
     
-    error_id = id(exc)  # Simple error ID for tracking
-    error_traceback = traceback.format_exc()
+    error_id = f"{next(_err_seq):08x}"  # Short error ID for correlating logs
     
-    # Log the full error with traceback
-    logger.error(
-        f"Unhandled exception [{error_id}]: {type(exc).__name__}: {str(exc)}\n"
-        f"Path: {request.url.path}\n"
-        f"Method: {request.method}\n"
-        f"Traceback:\n{error_traceback}"
+    # Log the full error with traceback; logging only formats the traceback
+    # when the record is actually emitted
+    _log_error(
+        "Unhandled exception [%s]: %s: %s\nPath: %s\nMethod: %s",
+        error_id, type(exc).__name__, exc, request.url.path, request.method,
+        exc_info=exc,
     )
     
     # Return safe error response without exposing internal details
@@ -81,7 +113,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "An internal server error occurred. Please try again later.",
-            "error_id": str(error_id),
+            "error_id": error_id,
             "type": "InternalServerError"
         }
     )
@@ -90,7 +122,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors gracefully."""
-    logger.warning(f"Validation error on {request.url.path}: {exc.errors()}")
+    _log_warning("Validation error on %s: %s", request.url.path, exc.errors())
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={
@@ -103,42 +135,35 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 app.include_router(youtube_router)
 app.include_router(service_router)
 
+# Root and health responses only depend on startup settings, so they are built
+# once and the same bytes are sent on every request (including frequent probes)
+_ROOT = Response(
+    content=orjson.dumps({
+        "message": f"Welcome to the {settings.PROJECT_NAME}",
+        "version": "1.1.0",
+        "docs": "/docs",
+        "redoc": "/redoc",
+        "service": "/service/info",
+        "status": "/service/status",
+        "health": "/health"
+    }),
+    media_type="application/json",
+)
+_HEALTH = Response(content=b'{"status":"healthy"}', media_type="application/json")
+
 @app.get("/", tags=["root"])
 async def root():
     """Root endpoint that provides API information"""
-    try:
-        return {
-            "message": f"Welcome to the {settings.PROJECT_NAME}",
-            "version": "1.1.0",
-            "docs": "/docs",
-            "redoc": "/redoc",
-            "service": "/service/info",
-            "status": "/service/status",
-            "health": "/health"
-        }
-    except Exception as e:
-        logger.error(f"Unexpected error in root endpoint: {str(e)}", exc_info=True)
-        # Even if there's an error, try to return basic info
-        return {
-            "message": "Welcome to the YouTube Tools API",
-            "version": "1.1.0",
-            "status": "error",
-            "health": "/health"
-        }
+    return _ROOT
 
 @app.get("/health", tags=["health"])
 async def health_check():
     """Health check endpoint - should always return healthy if server is running"""
-    try:
-        return {"status": "healthy"}
-    except Exception as e:
-        logger.error(f"Unexpected error in health check: {str(e)}", exc_info=True)
-        # Health check should be resilient - return unhealthy status instead of crashing
-        return {"status": "unhealthy", "error": "Health check failed"}
+    return _HEALTH
 
 def start():
     """Function to start the server"""
-    logger.info(f"Starting server on {settings.HOST}:{settings.PORT}")
+    logger.info("Starting server on %s:%s", settings.HOST, settings.PORT)
     uvicorn.run("app.main:app", host=settings.HOST, port=settings.PORT, reload=True)
 
 if __name__ == "__main__":
@@ -8,8 +8,12 @@ from typing import Dict, Any
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import HTMLResponse
 
-from app.core.config import settings
-from app.utils.transcript_cache import get_cache
+from app.core.config import get_settings
+from app.utils.transcript_cache import cache
+from app.utils.disk_cache import disk_cache
+from app.utils.redis_cache import redis_cache
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +33,6 @@ async def service_status() -> Dict[str, Any]:
         Dictionary containing service status, version, configuration, and cache stats
     """
     try:
-        cache = get_cache()
-        
         return {
             "status": "operational",
             "version": "1.1.0",
@@ -48,11 +50,15 @@ async def service_status() -> Dict[str, Any]:
                 "cache_size": cache.size(),
                 "cache_max_size": cache.max_size,
                 "cache_ttl_seconds": cache.ttl_seconds,
+                "redis_cache_enabled": redis_cache.enabled,
+                "disk_cache_enabled": disk_cache.enabled and not redis_cache.enabled,
             },
             "endpoints": {
                 "metadata": "/youtube/metadata",
                 "captions": "/youtube/captions",
+                "captions_bulk": "/youtube/captions/bulk",
                 "timestamps": "/youtube/timestamps",
+                "timestamps_bulk": "/youtube/timestamps/bulk",
                 "cache_stats": "/youtube/cache/stats",
                 "cache_clear": "/youtube/cache/clear",
                 "health": "/health",
@@ -65,7 +71,7 @@ async def service_status() -> Dict[str, Any]:
             },
         }
     except Exception as e:
-        logger.error(f"Unexpected error in service_status: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in %s: %s", "service_status", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve service status: {str(e)}"
@@ -81,10 +87,9 @@ async def service_info() -> str:
         HTML page with service information, status, and links
     """
     try:
-        cache = get_cache()
         status_data = await service_status()
     except Exception as e:
-        logger.error(f"Unexpected error in service_info: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in %s: %s", "service_info", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         # Return a simple error page instead of crashing
         return f"""
         <!DOCTYPE html>
@@ -292,7 +297,7 @@ async def service_info() -> str:
                         <div class="info-card">
                             <h3>CORS</h3>
                             <p>Status: <span class="badge badge-success">Enabled</span></p>
-                            <p>Origins: <code>{', '.join(status_data['cors']['allowed_origins']) if isinstance(status_data['cors']['allowed_origins'], list) else status_data['cors']['allowed_origins']}</code></p>
+                            <p>Origins: <code>{', '.join(status_data['cors']['allowed_origins']) if isinstance(status_data['cors']['allowed_origins'], (list, tuple)) else status_data['cors']['allowed_origins']}</code></p>
                         </div>
                     </div>
                 </div>
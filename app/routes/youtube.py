@@ -1,19 +1,87 @@
 import logging
-from typing import List, Optional
+from typing import Any, Callable, Coroutine, List, Optional, Tuple
 
-from fastapi import APIRouter, Query, HTTPException
+import orjson
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.core.config import get_settings
 from app.utils.youtube_tools import YouTubeTools
-from app.utils.transcript_cache import get_cache
+from app.utils.transcript_cache import cache, DEFAULT_LANGUAGES
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
+# Bound once so the error paths skip the attribute lookups on every call
+_log_error = logger.error
+_is_enabled_for = logger.isEnabledFor
+
+
+# Wording of the 500 detail ("Failed to <action>: ...") per endpoint; routes
+# not listed here fall back to their lower-cased summary
+_ERROR_ACTIONS = {
+    "get_video_metadata": "retrieve video metadata",
+    "get_video_captions": "retrieve video captions",
+    "get_video_captions_bulk": "retrieve video captions",
+    "get_video_timestamps": "retrieve video timestamps",
+    "get_video_timestamps_bulk": "retrieve video timestamps",
+    "get_cache_stats": "retrieve cache statistics",
+    "clear_cache": "clear cache",
+    "test_performance": "run performance test",
+}
+
+
+class SafeRoute(APIRoute):
+    """Route class that turns unexpected handler errors into HTTP 500 responses.
+
+    HTTP and validation errors are re-raised untouched so FastAPI keeps
+    handling them; anything else is logged once here instead of in a
+    ``try/except`` block inside every endpoint.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+        action = _ERROR_ACTIONS.get(self.name) or (self.summary or self.name).lower()
+
+        async def safe_route_handler(request: Request) -> Response:
+            try:
+                return await original_route_handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                _log_error(
+                    "Unexpected error in %s: %s", self.name, e,
+                    exc_info=_is_enabled_for(logging.DEBUG),
+                )
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to {action}: {str(e)}"
+                )
+
+        return safe_route_handler
+
 
 router = APIRouter(
     prefix="/youtube",
     tags=["youtube"],
     responses={404: {"description": "Not found"}},
+    route_class=SafeRoute,
 )
 
+# Everything in the cache stats payload except "size" is fixed at startup, so
+# the JSON is pre-serialized up to that field and only the size is appended.
+_CACHE_STATS_PREFIX = orjson.dumps({
+    "enabled": cache.enabled,
+    "max_size": cache.max_size,
+    "ttl_seconds": cache.ttl_seconds,
+})[:-1] + b',"size":'
+
+def _language_tuple(languages: Optional[List[str]]) -> Tuple[str, ...]:
+    """Convert the parsed ``languages`` query list to the tuple passed down the stack."""
+    return tuple(languages) if languages else DEFAULT_LANGUAGES
+
 # NOTE: We switched to **query parameters** so users can simply paste a URL or
 # video ID in the Swagger UI without having to wrap it in a JSON object.  The
 # *languages* parameter defaults to ``["en"]`` so callers can ignore it when
@@ -30,17 +98,7 @@ async def get_video_metadata(
     ),
 ):
     """Return basic video information such as *title*, *author* and *thumbnail*."""
-    try:
-        return await YouTubeTools.get_video_data(video)
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is (they're already properly formatted)
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_video_metadata: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve video metadata: {str(e)}"
-        )
+    return await YouTubeTools.get_video_data(video)
 
 @router.get(
     "/captions",
@@ -50,19 +108,29 @@ async def get_video_metadata(
 async def get_video_captions(
     video: str = Query(..., description="YouTube video URL or ID"),
     languages: Optional[List[str]] = Query(None, description="Preferred caption languages (ISO 639-1 codes). Default: ['en']"),
+    any_language: bool = Query(
+        False, description="If none of the requested languages is available, return any transcript the video has"
+    ),
 ):
     """Return plain-text captions for the requested video (English by default)."""
-    try:
-        return await YouTubeTools.get_video_captions(video, languages)
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is (they're already properly formatted)
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_video_captions: {str(e)}", exc_info=True)
+    return await YouTubeTools.get_video_captions(video, _language_tuple(languages), any_language)
+
+@router.get(
+    "/captions/bulk",
+    summary="Get plain-text captions for several videos",
+    response_description="Mapping of each requested video to its caption text (or an error).",
+)
+async def get_video_captions_bulk(
+    videos: List[str] = Query(..., description="YouTube video URLs or IDs (repeat the parameter for each video)"),
+    languages: Optional[List[str]] = Query(None, description="Preferred caption languages (ISO 639-1 codes). Default: ['en']"),
+):
+    """Return plain-text captions for up to ``BULK_MAX_VIDEOS`` videos, fetched concurrently."""
+    if len(videos) > settings.BULK_MAX_VIDEOS:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve video captions: {str(e)}"
+            status_code=400,
+            detail=f"Too many videos requested (maximum is {settings.BULK_MAX_VIDEOS})"
         )
+    return await YouTubeTools.get_video_captions_bulk(videos, _language_tuple(languages))
 
 @router.get(
     "/timestamps",
@@ -74,17 +142,24 @@ async def get_video_timestamps(
     languages: Optional[List[str]] = Query(None, description="Preferred caption languages (ISO 639-1 codes). Default: ['en']"),
 ):
     """Return caption text with starting timestamps (English by default)."""
-    try:
-        return await YouTubeTools.get_video_timestamps(video, languages)
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is (they're already properly formatted)
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_video_timestamps: {str(e)}", exc_info=True)
+    return await YouTubeTools.get_video_timestamps(video, _language_tuple(languages))
+
+@router.get(
+    "/timestamps/bulk",
+    summary="Get caption timestamps for several videos",
+    response_description="Mapping of each requested video to its timestamped caption lines (or an error).",
+)
+async def get_video_timestamps_bulk(
+    videos: List[str] = Query(..., description="YouTube video URLs or IDs (repeat the parameter for each video)"),
+    languages: Optional[List[str]] = Query(None, description="Preferred caption languages (ISO 639-1 codes). Default: ['en']"),
+):
+    """Return timestamped captions for up to ``BULK_MAX_VIDEOS`` videos, fetched concurrently."""
+    if len(videos) > settings.BULK_MAX_VIDEOS:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve video timestamps: {str(e)}"
+            status_code=400,
+            detail=f"Too many videos requested (maximum is {settings.BULK_MAX_VIDEOS})"
         )
+    return await YouTubeTools.get_video_timestamps_bulk(videos, _language_tuple(languages))
 
 @router.get(
     "/cache/stats",
@@ -93,69 +168,54 @@ async def get_video_timestamps(
 )
 async def get_cache_stats():
     """Return cache statistics and configuration."""
-    try:
-        cache = get_cache()
-        return {
-            "enabled": cache.enabled,
-            "size": cache.size(),
-            "max_size": cache.max_size,
-            "ttl_seconds": cache.ttl_seconds,
-        }
-    except Exception as e:
-        logger.error(f"Unexpected error in get_cache_stats: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve cache statistics: {str(e)}"
-        )
+    return Response(
+        content=_CACHE_STATS_PREFIX + b"%d}" % cache.size(),
+        media_type="application/json",
+    )
 
 @router.delete(
     "/cache/clear",
     summary="Clear transcript cache",
-    response_description="Clears all cached transcripts.",
+    response_description="Clears all cached transcripts (in-process and Redis/disk cache).",
 )
 async def clear_cache():
-    """Clear all cached transcripts."""
-    try:
-        cache = get_cache()
-        cache.clear()
-        return {"message": "Cache cleared successfully", "size": cache.size()}
-    except Exception as e:
-        logger.error(f"Unexpected error in clear_cache: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to clear cache: {str(e)}"
-        )
+    """Clear all cached transcripts, including the Redis or disk cache when configured."""
+    await YouTubeTools.clear_transcript_cache()
+    return {"message": "Cache cleared successfully", "size": cache.size()}
 
-@router.get(
-    "/performance/test",
-    summary="Test transcript performance",
-    response_description="Performance metrics for transcript fetching (cache miss vs cache hit).",
-)
-async def test_performance(
-    video: str = Query(..., description="YouTube video URL or ID"),
-    runs: int = Query(3, ge=2, le=10, description="Number of test runs (default: 3)"),
-    languages: Optional[List[str]] = Query(None, description="Preferred caption languages. Default: ['en']"),
-):
-    """
-    Test transcript fetching performance.
+# The performance test issues up to ``runs`` transcript fetches from a single
+# request and fills the cache as a side effect, so it is only registered when
+# DEBUG is enabled.
+if settings.DEBUG:
+    @router.get(
+        "/performance/test",
+        summary="Test transcript performance",
+        response_description="Performance metrics for transcript fetching (cache miss vs cache hit).",
+    )
+    async def test_performance(
+        video: str = Query(..., description="YouTube video URL or ID"),
+        runs: int = Query(3, ge=2, le=10, description="Number of test runs (default: 3)"),
+        languages: Optional[List[str]] = Query(None, description="Preferred caption languages. Default: ['en']"),
+    ):
+        """
+        Test transcript fetching performance.
     
-    Makes multiple requests to measure cache miss (first request) vs cache hit (subsequent requests) performance.
-    Useful for benchmarking cache effectiveness.
+        Makes multiple requests to measure cache miss (first request) vs cache hit (subsequent requests) performance.
+        Useful for benchmarking cache effectiveness.
     
-    Returns:
-        Performance metrics including response times and speedup factor
-    """
-    try:
+        Returns:
+            Performance metrics including response times and speedup factor
+        """
         import time
-        
+    
         video_id = YouTubeTools.get_youtube_video_id(video)
         if not video_id:
             raise HTTPException(status_code=400, detail="Invalid YouTube URL/ID")
-        
-        normalized_languages = languages or ["en"]
+    
+        normalized_languages = _language_tuple(languages)
         times = []
         errors = []
-        
+    
         for i in range(runs):
             start_time = time.perf_counter()
             try:
@@ -167,19 +227,19 @@ async def test_performance(
                 elapsed = time.perf_counter() - start_time
                 errors.append(str(e))
                 times.append(None)
-        
+    
         if not times or all(t is None for t in times):
             raise HTTPException(
                 status_code=500,
                 detail=f"All requests failed. Errors: {', '.join(errors) if errors else 'Unknown error'}"
             )
-        
+    
         # Filter out None values for calculations
         valid_times = [t for t in times if t is not None]
-        
+    
         cache_miss_time = valid_times[0] if valid_times else None
         cache_hit_times = valid_times[1:] if len(valid_times) > 1 else []
-        
+    
         result = {
             "video_id": video_id,
             "runs": runs,
@@ -199,14 +259,5 @@ async def test_performance(
             } if cache_hit_times else None,
             "speedup": cache_miss_time / (sum(cache_hit_times) / len(cache_hit_times)) if cache_miss_time and cache_hit_times else None,
         }
-        
+    
         return result
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is (they're already properly formatted)
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in test_performance: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to run performance test: {str(e)}"
-        )
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Persistent on-disk transcript cache.
+
+Used as the second cache level on single-node deployments that don't run
+Redis, so cached transcripts survive restarts. Backed by ``diskcache`` (SQLite
+plus files) and disabled unless ``DISK_CACHE_DIR`` is set. Disk operations run
+in a worker thread so they never block the event loop; errors are logged and
+treated as cache misses.
+"""
+import asyncio
+import logging
+import threading
+from typing import List, Optional, Sequence
+
+from app.core.config import get_settings
+from app.utils.transcript_cache import Transcript, pack_transcript, unpack_transcript
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Disk-backed transcript cache with the same interface as RedisCache.
+    
+    Keys look like ``yt:tr:<video_id>:<lang,lang>`` and values are
+    msgpack+zstd blobs (see :func:`pack_transcript`).
+    """
+    __slots__ = ("_cache", "_lock", "enabled", "directory", "ttl_seconds", "size_limit")
+    
+    def __init__(self):
+        self._cache = None
+        self._lock = threading.Lock()
+        self.directory = settings.DISK_CACHE_DIR
+        self.enabled = bool(self.directory)
+        self.ttl_seconds = settings.DISK_CACHE_TTL_SECONDS
+        self.size_limit = settings.DISK_CACHE_SIZE_LIMIT
+    
+    def _get_cache(self):
+        """Open the cache directory on first use (called from worker threads)."""
+        with self._lock:
+            if self._cache is None:
+                # Imported lazily so deployments without a disk cache don't load it
+                from diskcache import Cache
+                self._cache = Cache(self.directory, size_limit=self.size_limit)
+            return self._cache
+    
+    def _read(self, key: str) -> Optional[bytes]:
+        """Blocking GET, run via ``asyncio.to_thread``."""
+        return self._get_cache().get(key)
+    
+    def _write(self, key: str, blob: bytes) -> None:
+        """Blocking SET with the disk cache TTL, run via ``asyncio.to_thread``."""
+        self._get_cache().set(key, blob, expire=self.ttl_seconds)
+    
+    def _clear(self) -> int:
+        """Blocking delete of every entry, run via ``asyncio.to_thread``."""
+        return self._get_cache().clear()
+    
+    @staticmethod
+    def _transcript_key(video_id: str, languages: Sequence[str]) -> str:
+        """Create a transcript key; languages are sorted to match the in-process cache."""
+        return f"yt:tr:{video_id}:{','.join(sorted(languages))}"
+    
+    async def get_transcript(self, video_id: str, languages: Sequence[str]) -> Optional[List[Transcript]]:
+        """
+        Get a cached transcript.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Language codes used to fetch the transcript
+            
+        Returns:
+            List of transcript snippets if cached, None otherwise
+        """
+        if not self.enabled:
+            return None
+        
+        key = self._transcript_key(video_id, languages)
+        try:
+            blob = await asyncio.to_thread(self._read, key)
+            return unpack_transcript(blob) if blob is not None else None
+        except Exception as e:
+            logger.warning("Disk cache read %s failed: %s", key, e)
+            return None
+    
+    async def set_transcript(self, video_id: str, transcript: List[Transcript], languages: Sequence[str]) -> None:
+        """
+        Cache a transcript.
+        
+        Args:
+            video_id: YouTube video ID
+            transcript: Transcript snippets (any objects with text/start/duration)
+            languages: Language codes used to fetch the transcript
+        """
+        if not self.enabled:
+            return
+        
+        key = self._transcript_key(video_id, languages)
+        blob = pack_transcript(transcript)
+        try:
+            await asyncio.to_thread(self._write, key, blob)
+        except Exception as e:
+            logger.warning("Disk cache write %s failed: %s", key, e)
+    
+    async def clear_transcripts(self) -> None:
+        """Delete every cached transcript."""
+        if not self.enabled:
+            return
+        
+        try:
+            await asyncio.to_thread(self._clear)
+        except Exception as e:
+            logger.warning("Disk cache clear failed: %s", e)
+    
+    def close(self) -> None:
+        """Close the underlying cache files, if they were opened."""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+
+# Global disk cache instance
+disk_cache = DiskCache()
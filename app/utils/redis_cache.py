@@ -0,0 +1,213 @@
+"""
+Redis-backed shared cache for transcripts and oEmbed metadata.
+
+Sits between the in-process TranscriptCache and YouTube so that multiple
+worker processes or pods share cache hits. It is disabled unless
+``REDIS_URL`` is set, and Redis errors are logged and treated as misses so
+an unavailable Redis never fails a request.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+
+from app.core.config import get_settings
+from app.utils.transcript_cache import Transcript, pack_transcript, unpack_transcript
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# Keys deleted per UNLINK when clearing transcripts
+_CLEAR_BATCH_SIZE = 500
+
+# Metadata is kept this many TTLs past its freshness window so that a stale copy
+# (with its validators) is still around to revalidate with a conditional request
+_OEMBED_RETAIN_FACTOR = 7
+
+
+class RedisCache:
+    """
+    Async Redis cache for transcripts and video metadata.
+    
+    Transcript keys look like ``yt:tr:<video_id>:<lang,lang>`` and hold
+    msgpack+zstd blobs (see :func:`pack_transcript`); metadata keys look like
+    ``yt:oe2:<video_id>`` and hold a JSON entry with the metadata plus its HTTP
+    validators (ETag / Last-Modified). Values expire via Redis TTLs.
+    """
+    __slots__ = ("_client", "enabled", "url", "timeout_seconds", "transcript_ttl_seconds", "oembed_ttl_seconds")
+    
+    def __init__(self):
+        self._client = None
+        self.url = settings.REDIS_URL
+        self.enabled = bool(self.url)
+        self.timeout_seconds = settings.REDIS_TIMEOUT_SECONDS
+        self.transcript_ttl_seconds = settings.REDIS_TRANSCRIPT_TTL_SECONDS
+        self.oembed_ttl_seconds = settings.REDIS_OEMBED_TTL_SECONDS
+    
+    def _get_client(self):
+        """Create the Redis client on first use."""
+        if self._client is None:
+            # Imported lazily so deployments without Redis don't load the client
+            import redis.asyncio as redis
+            # Explicit timeouts: older redis-py defaults to none, so a blackholed
+            # server would stall requests for the OS connect timeout (minutes)
+            self._client = redis.from_url(
+                self.url,
+                socket_connect_timeout=self.timeout_seconds,
+                socket_timeout=self.timeout_seconds,
+            )
+        return self._client
+    
+    @staticmethod
+    def _transcript_key(video_id: str, languages: Sequence[str]) -> str:
+        """Create a transcript key; languages are sorted to match the in-process cache."""
+        return f"yt:tr:{video_id}:{','.join(sorted(languages))}"
+    
+    @staticmethod
+    def _oembed_key(video_id: str) -> str:
+        """Create a video metadata key.
+        
+        ``oe2`` entries carry validators; the bare metadata stored under the
+        old ``yt:oe:`` prefix is never read and simply expires.
+        """
+        return f"yt:oe2:{video_id}"
+    
+    async def _get(self, key: str) -> Optional[bytes]:
+        """GET a key, treating any Redis error as a miss."""
+        try:
+            return await self._get_client().get(key)
+        except Exception as e:
+            logger.warning("Redis GET %s failed: %s", key, e)
+            return None
+    
+    async def _set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """SET a key with a TTL, logging (not raising) Redis errors."""
+        try:
+            await self._get_client().set(key, value, ex=ttl_seconds)
+        except Exception as e:
+            logger.warning("Redis SET %s failed: %s", key, e)
+    
+    async def get_transcript(self, video_id: str, languages: Sequence[str]) -> Optional[List[Transcript]]:
+        """
+        Get a cached transcript.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Language codes used to fetch the transcript
+            
+        Returns:
+            List of transcript snippets if cached, None otherwise
+        """
+        if not self.enabled:
+            return None
+        
+        key = self._transcript_key(video_id, languages)
+        blob = await self._get(key)
+        if blob is None:
+            return None
+        try:
+            return unpack_transcript(blob)
+        except Exception as e:
+            logger.warning("Discarding undecodable Redis value %s: %s", key, e)
+            return None
+    
+    async def set_transcript(self, video_id: str, transcript: List[Transcript], languages: Sequence[str]) -> None:
+        """
+        Cache a transcript.
+        
+        Args:
+            video_id: YouTube video ID
+            transcript: Transcript snippets (any objects with text/start/duration)
+            languages: Language codes used to fetch the transcript
+        """
+        if not self.enabled:
+            return
+        
+        blob = pack_transcript(transcript)
+        await self._set(self._transcript_key(video_id, languages), blob, self.transcript_ttl_seconds)
+    
+    async def clear_transcripts(self) -> None:
+        """Delete every cached transcript (metadata entries are kept)."""
+        if not self.enabled:
+            return
+        
+        try:
+            client = self._get_client()
+            batch = []
+            async for key in client.scan_iter(match="yt:tr:*", count=_CLEAR_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= _CLEAR_BATCH_SIZE:
+                    await client.unlink(*batch)
+                    batch.clear()
+            if batch:
+                await client.unlink(*batch)
+        except Exception as e:
+            logger.warning("Redis transcript clear failed: %s", e)
+    
+    async def get_oembed(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached video metadata entry.
+        
+        Returns:
+            None if not cached, otherwise a dict with ``body`` (the metadata),
+            ``etag`` and ``last_modified`` (validators, may be None) and
+            ``fresh`` (False once the entry is older than the oEmbed TTL and
+            should be revalidated before use)
+        """
+        if not self.enabled:
+            return None
+        
+        key = self._oembed_key(video_id)
+        blob = await self._get(key)
+        if blob is None:
+            return None
+        try:
+            entry = orjson.loads(blob)
+            body = entry["body"]
+            if not isinstance(body, dict):
+                raise ValueError("metadata body is not an object")
+            return {
+                "body": body,
+                "etag": entry.get("etag"),
+                "last_modified": entry.get("last_modified"),
+                "fresh": entry.get("fresh_until", 0) > time.time(),
+            }
+        except Exception as e:
+            logger.warning("Discarding undecodable Redis value %s: %s", key, e)
+            return None
+    
+    async def set_oembed(
+        self,
+        video_id: str,
+        video_data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Cache video metadata along with the validators from its response."""
+        if not self.enabled:
+            return
+        
+        entry = {
+            "body": video_data,
+            "etag": etag,
+            "last_modified": last_modified,
+            # Wall-clock time, since entries are shared across hosts
+            "fresh_until": time.time() + self.oembed_ttl_seconds,
+        }
+        await self._set(
+            self._oembed_key(video_id),
+            orjson.dumps(entry),
+            self.oembed_ttl_seconds * _OEMBED_RETAIN_FACTOR,
+        )
+    
+    async def close(self) -> None:
+        """Close the Redis connection pool, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global Redis cache instance
+redis_cache = RedisCache()
@@ -4,44 +4,138 @@ Transcript cache module for storing YouTube transcript data.
 Provides in-memory caching with TTL (time-to-live) support to reduce
 API calls and improve response times.
 """
+import sys
 import time
-from typing import Optional, List, Tuple, TypedDict
-from collections import OrderedDict
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, List, Sequence, Tuple, Union
 
-from app.core.config import settings
+from app.core.config import get_settings
 
+settings = get_settings()
 
-class Transcript(TypedDict):
-    """Type definition for YouTube transcript snippet."""
+
+class Transcript(NamedTuple):
+    """YouTube transcript snippet (same attributes as the library's snippet objects).
+    
+    A NamedTuple, so instances have no per-instance ``__dict__`` and fields
+    are read by index; fetched snippets are converted to it before caching.
+    """
     text: str
     start: float
     duration: float
 
 
+class CompactTranscript:
+    """
+    Transcript stored column-wise for the in-process cache.
+    
+    Texts are kept in one tuple and start/duration times in ``array('d')``
+    columns, so each snippet costs 16 bytes of numbers instead of a tuple
+    plus two float objects. Iterating yields :class:`Transcript` snippets,
+    and ``texts`` can be used directly when only the text is needed.
+    """
+    __slots__ = ("texts", "starts", "durations")
+    
+    def __init__(self, snippets: Iterable[Transcript]):
+        snippets = snippets if isinstance(snippets, (list, tuple)) else list(snippets)
+        self.texts: Tuple[str, ...] = tuple([s.text for s in snippets])
+        self.starts = array("d", [s.start for s in snippets])
+        self.durations = array("d", [s.duration for s in snippets])
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __iter__(self) -> Iterator[Transcript]:
+        return map(Transcript, self.texts, self.starts, self.durations)
+
+
+class CachedError(NamedTuple):
+    """Negative cache entry: why a transcript could not be fetched."""
+    status_code: int
+    detail: str
+
+
+CacheValue = Union[CompactTranscript, CachedError]
+
+
+# Default caption languages, shared as one tuple so the common case allocates nothing
+DEFAULT_LANGUAGES: Tuple[str, ...] = ("en",)
+
+
+@lru_cache(maxsize=128)
+def _normalize_languages(languages: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Return the sorted, interned language tuple used in cache keys (memoized per input tuple)."""
+    return tuple(sys.intern(lang) for lang in sorted(languages)) if languages else DEFAULT_LANGUAGES
+
+
+@lru_cache(maxsize=1)
+def _zstd():
+    """Return a shared (compressor, decompressor) pair, importing zstandard on first use."""
+    import zstandard
+    return zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+
+
+def pack_transcript(transcript: Sequence[Transcript]) -> bytes:
+    """
+    Serialize transcript snippets to a compact blob for out-of-process caches.
+    
+    Snippets are encoded as msgpack ``[text, start, duration]`` rows and
+    compressed with zstd (level 3), which is several times smaller than the
+    equivalent Python objects or JSON.
+    """
+    import msgpack
+    if isinstance(transcript, CompactTranscript):
+        rows = list(zip(transcript.texts, transcript.starts, transcript.durations))
+    else:
+        rows = [(s.text, s.start, s.duration) for s in transcript]
+    return _zstd()[0].compress(msgpack.packb(rows))
+
+
+def unpack_transcript(blob: bytes) -> List[Transcript]:
+    """Inverse of :func:`pack_transcript`."""
+    import msgpack
+    rows = msgpack.unpackb(_zstd()[1].decompress(blob))
+    return [Transcript(*row) for row in rows]
+
+
 class TranscriptCache:
     """
     In-memory cache for YouTube transcripts with TTL support.
     
     Uses LRU (Least Recently Used) eviction when cache reaches max size.
-    Cache keys are tuples of (video_id, language_tuple).
+    Cache keys are tuples of (video_id, language_tuple). Values are either
+    transcripts or :class:`CachedError` entries for failed fetches, which are
+    usually stored with a shorter TTL.
     """
+    __slots__ = ("_cache", "enabled", "ttl_seconds", "max_size")
     
     def __init__(self):
-        self._cache: OrderedDict[Tuple[str, tuple], Tuple[List[Transcript], float]] = OrderedDict()
+        # Plain dicts keep insertion order, so the first key is the least recently used
+        # Entries are (value, expires_at) with expires_at on the monotonic clock
+        self._cache: Dict[Tuple[str, tuple], Tuple[CacheValue, float]] = {}
         self.enabled = settings.CACHE_ENABLED
         self.ttl_seconds = settings.CACHE_TTL_SECONDS
         self.max_size = settings.CACHE_MAX_SIZE
     
-    def _make_key(self, video_id: str, languages: Optional[List[str]]) -> Tuple[str, tuple]:
+    def _make_key(self, video_id: str, languages: Optional[Sequence[str]]) -> Tuple[str, tuple]:
         """Create a cache key from video_id and languages."""
-        lang_tuple = tuple(sorted(languages)) if languages else ("en",)
-        return (video_id, lang_tuple)
+        if languages is not None and not isinstance(languages, tuple):
+            languages = tuple(languages)
+        # Callers pass interned video IDs (see YouTubeTools), so repeated
+        # lookups compare keys by identity
+        return (video_id, _normalize_languages(languages))
     
-    def _is_expired(self, timestamp: float) -> bool:
-        """Check if a cache entry has expired based on TTL."""
-        return time.time() - timestamp > self.ttl_seconds
+    @staticmethod
+    def _is_expired(expires_at: float) -> bool:
+        """Check if a cache entry has passed its expiry time.
+        
+        Deadlines come from ``time.monotonic()`` so wall-clock adjustments
+        (NTP steps, manual changes) can't expire or resurrect entries.
+        """
+        return time.monotonic() > expires_at
     
-    def get(self, video_id: str, languages: Optional[List[str]] = None) -> Optional[List[Transcript]]:
+    def get(self, video_id: str, languages: Optional[Sequence[str]] = None) -> Optional[CacheValue]:
         """
         Get cached transcript if available and not expired.
         
@@ -50,52 +144,62 @@ class TranscriptCache:
             languages: List of language codes (e.g., ["en", "es"])
             
         Returns:
-            Cached transcript list if found and valid, None otherwise
+            Cached transcript list (or CachedError for a cached failure) if
+            found and valid, None otherwise
         """
         if not self.enabled:
             return None
         
         key = self._make_key(video_id, languages)
         
-        if key not in self._cache:
+        # Single lookup instead of a membership test followed by indexing
+        entry = self._cache.get(key)
+        if entry is None:
             return None
         
-        transcript, timestamp = self._cache[key]
+        transcript, expires_at = entry
         
         # Check if expired
-        if self._is_expired(timestamp):
+        if self._is_expired(expires_at):
             del self._cache[key]
             return None
         
-        # Move to end (most recently used)
-        self._cache.move_to_end(key)
+        # Move to end (most recently used) by re-inserting
+        del self._cache[key]
+        self._cache[key] = entry
         return transcript
     
-    def set(self, video_id: str, transcript: List[Transcript], languages: Optional[List[str]] = None) -> None:
+    def set(
+        self,
+        video_id: str,
+        transcript: CacheValue,
+        languages: Optional[Sequence[str]] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
         """
         Cache a transcript.
         
         Args:
             video_id: YouTube video ID
-            transcript: List of transcript snippets
+            transcript: Transcript snippets, or a CachedError
             languages: List of language codes used to fetch the transcript
+            ttl_seconds: Lifetime of this entry (defaults to the cache TTL)
         """
         if not self.enabled:
             return
         
         key = self._make_key(video_id, languages)
-        timestamp = time.time()
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
         
         # Remove if already exists
-        if key in self._cache:
-            del self._cache[key]
+        self._cache.pop(key, None)
         
         # Evict oldest entries if cache is full
         while len(self._cache) >= self.max_size:
-            self._cache.popitem(last=False)  # Remove oldest (first) item
+            del self._cache[next(iter(self._cache))]  # Remove oldest (first) item
         
         # Add new entry
-        self._cache[key] = (transcript, timestamp)
+        self._cache[key] = (transcript, expires_at)
     
     def clear(self) -> None:
         """Clear all cached transcripts."""
@@ -116,8 +220,8 @@ class TranscriptCache:
             return 0
         
         expired_keys = [
-            key for key, (_, timestamp) in self._cache.items()
-            if self._is_expired(timestamp)
+            key for key, (_, expires_at) in self._cache.items()
+            if self._is_expired(expires_at)
         ]
         
         for key in expired_keys:
@@ -126,11 +230,11 @@ class TranscriptCache:
         return len(expired_keys)
 
 
-# Global cache instance
-_transcript_cache = TranscriptCache()
+# Global cache instance - import it directly (``from ... import cache``)
+cache = TranscriptCache()
 
 
 def get_cache() -> TranscriptCache:
-    """Get the global transcript cache instance."""
-    return _transcript_cache
+    """Get the global transcript cache instance (kept for backward compatibility)."""
+    return cache
 
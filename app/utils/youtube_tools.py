@@ -1,18 +1,195 @@
 import asyncio
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import httpx
-from urllib.parse import urlparse, parse_qs, urlencode
-from typing import Optional, List
+import orjson
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, List, Sequence, Tuple
 
 from fastapi import HTTPException
-from youtube_transcript_api import YouTubeTranscriptApi  # type: ignore
-from youtube_transcript_api.proxies import GenericProxyConfig, WebshareProxyConfig
-from app.core.config import settings
-from app.utils.transcript_cache import get_cache, Transcript
+from app.core.config import get_settings
+from app.utils.transcript_cache import cache, CachedError, CompactTranscript, DEFAULT_LANGUAGES
+from app.utils.disk_cache import disk_cache
+from app.utils.redis_cache import redis_cache
+
+settings = get_settings()
+
+if TYPE_CHECKING:
+    from youtube_transcript_api import YouTubeTranscriptApi  # type: ignore
+
+# Matches every accepted input form (see YouTubeTools.get_youtube_video_id) in
+# one pass; group 1 is the 11-character video ID (from the first ``v=`` query
+# parameter, as parse_qs(...)["v"][0] gave). Case-insensitive because
+# schemes and hostnames are (the captured ID keeps its original case).
+_VIDEO_ID_RE = re.compile(
+    r"(?:(?:https?://)?"
+    r"(?:(?:www\.|m\.)?youtube\.com(?::\d+)?/(?:watch\?(?:(?!v=)[^#&]*&)*?v=|embed/|v/)"
+    r"|youtu\.be(?::\d+)?/))?"
+    r"([A-Za-z0-9_-]{11})"
+    r"(?=$|[&?#/])",
+    re.IGNORECASE,
+)
+
+# Cheap screens for obviously malformed input: anything longer than this or
+# containing characters that can't appear in a URL (RFC 3986 unreserved and
+# reserved characters plus percent-escapes) can't be a video URL/ID
+_MAX_INPUT_LENGTH = 256
+_SAFE_INPUT_RE = re.compile(r"[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=%]+")
+
+# Bounded pool for the blocking transcript API calls, so a burst of cache misses
+# can't grow threads without limit or starve other users of the default executor
+_transcript_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_transcript_executor() -> ThreadPoolExecutor:
+    """Return the transcript thread pool, creating it on first use (or after shutdown)."""
+    global _transcript_executor
+    if _transcript_executor is None:
+        _transcript_executor = ThreadPoolExecutor(
+            max_workers=settings.TRANSCRIPT_MAX_WORKERS,
+            thread_name_prefix="yt",
+        )
+    return _transcript_executor
+
+
+def shutdown_transcript_executor() -> None:
+    """Shut the transcript thread pool down without waiting for running fetches."""
+    global _transcript_executor
+    if _transcript_executor is not None:
+        _transcript_executor.shutdown(wait=False, cancel_futures=True)
+        _transcript_executor = None
+
+
+@lru_cache(maxsize=4096)
+def _extract_video_id(url_or_id: str) -> Optional[str]:
+    """Memoized body of :meth:`YouTubeTools.get_youtube_video_id`.
+
+    Clients tend to poll with the same URLs, so repeats (including inputs that
+    resolve to ``None``) are answered from the cache. IDs are interned so
+    cache-key hashing/comparison downstream hits the identity fast path.
+    """
+    if not _SAFE_INPUT_RE.fullmatch(url_or_id):
+        return None
+    match = _VIDEO_ID_RE.match(url_or_id)
+    return sys.intern(match.group(1)) if match else None
+
+# Second cache level for transcripts: Redis when configured (shared across
+# workers/pods), otherwise the on-disk cache (survives restarts); both are
+# no-ops when disabled
+_transcript_l2 = redis_cache if redis_cache.enabled else disk_cache
+
+# Appended to the cache languages of any_language loads, whose transcript may be
+# in a language that wasn't requested, so they never answer a regular request
+_ANY_LANGUAGE = "*"
+
+
+def _cache_languages(languages: Sequence[str], any_language: bool) -> Sequence[str]:
+    """Languages part of the cache key for a fetch."""
+    return (*languages, _ANY_LANGUAGE) if any_language else languages
+
+
+# Transcript loads currently in progress, keyed by (video_id, languages), so that
+# concurrent cache misses for the same video share one upstream fetch
+_inflight: Dict[Tuple[str, Tuple[str, ...]], "asyncio.Task[CompactTranscript]"] = {}
+
+# Shared HTTP client for oEmbed requests; reusing it keeps TCP/TLS connections
+# to youtube.com alive between requests instead of handshaking every time
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use (or after close).
+
+    Idle connections are kept for ``HTTP_KEEPALIVE_SECONDS`` (httpx defaults
+    to 5s), so sporadic cache misses reuse an open connection instead of
+    paying a DNS lookup and TLS handshake each time.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS,
+            ),
+            timeout=5.0,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its connection pool."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Bound %-format of the timestamp line; "%d" truncates floats, so minutes and
+# seconds come straight from the float start without int() or divmod()
+_FMT = "%d:%02d - %s".__mod__
+
+
+def _format_timestamps(transcript: CompactTranscript) -> List[str]:
+    """Format snippets as ``"M:SS - text"`` lines.
+
+    Built with a single list comprehension, which appends via one bytecode
+    instead of a method lookup and call per snippet.
+    """
+    return [
+        _FMT((start // 60, start % 60, text))
+        for text, start in zip(transcript.texts, transcript.starts)
+    ]
+
+
+def _negative_ttl(error: Exception) -> int:
+    """How long to remember a failed transcript fetch.
+
+    Videos without (matching) captions or that don't exist won't change soon,
+    so they are cached longer than other errors such as blocked requests.
+    Errors that didn't come from YouTube (e.g. the thread pool being shut
+    down) say nothing about the video and are not cached at all.
+    """
+    from youtube_transcript_api import (  # type: ignore
+        CouldNotRetrieveTranscript,
+        InvalidVideoId,
+        NoTranscriptFound,
+        TranscriptsDisabled,
+        VideoUnavailable,
+    )
+
+    if isinstance(error, (InvalidVideoId, NoTranscriptFound, TranscriptsDisabled, VideoUnavailable)):
+        return settings.CACHE_MISSING_TTL_SECONDS
+    if isinstance(error, CouldNotRetrieveTranscript):
+        return settings.CACHE_ERROR_TTL_SECONDS
+    return 0
+
+
+# Transcript API clients, one per transcript worker thread (built on first use).
+# YouTubeTranscriptApi is not thread-safe - a fetch mutates its requests.Session
+# (consent cookies) - so instances are never shared between threads; each thread
+# reusing its own still keeps that session's connection pool to YouTube alive.
+_thread_local = threading.local()
+
 
 class YouTubeTools:
     @staticmethod
-    def _get_youtube_api() -> YouTubeTranscriptApi:
+    def _get_youtube_api() -> "YouTubeTranscriptApi":
+        """Return the calling thread's YouTubeTranscriptApi instance, building it on first use."""
+        api = getattr(_thread_local, "api", None)
+        if api is None:
+            api = _thread_local.api = YouTubeTools._build_youtube_api()
+        return api
+
+    @staticmethod
+    def _build_youtube_api() -> "YouTubeTranscriptApi":
         """Create YouTubeTranscriptApi instance with proxy configuration if available."""
+        # Imported on first use so that startup and health checks don't pay for
+        # loading youtube_transcript_api and its dependencies
+        from youtube_transcript_api import YouTubeTranscriptApi  # type: ignore
+        from youtube_transcript_api.proxies import GenericProxyConfig, WebshareProxyConfig
+
         proxy_config = None
         
         if settings.PROXY_TYPE == "generic" and settings.PROXY_URL:
@@ -37,83 +214,148 @@ class YouTubeTools:
         return YouTubeTranscriptApi(proxy_config=proxy_config)
 
     @staticmethod
-    async def _fetch_transcript(video_id: str, languages: Optional[List[str]] = None) -> List[Transcript]:
+    def _fetch_any_language(video_id: str, languages: Sequence[str]):
+        """Fetch the first of *languages* available, else any transcript the video has.
+
+        Blocking; runs in a transcript worker thread. This makes the same single
+        ``list()`` round trip as ``fetch()`` and picks the language from it in
+        memory, so the fallback costs no extra requests to YouTube.
+        """
+        from youtube_transcript_api import NoTranscriptFound  # type: ignore
+
+        transcript_list = YouTubeTools._get_youtube_api().list(video_id)
+        try:
+            transcript = transcript_list.find_transcript(languages)
+        except NoTranscriptFound:
+            # Manually created transcripts are listed before generated ones
+            transcript = next(iter(transcript_list), None)
+            if transcript is None:
+                raise
+        return transcript.fetch()
+
+    @staticmethod
+    async def _fetch_transcript(
+        video_id: str, languages: Optional[Sequence[str]] = None, any_language: bool = False
+    ) -> CompactTranscript:
         """
         Fetch transcript for a video, using cache if available.
         
         This is a shared method used by both get_video_captions and get_video_timestamps
-        to avoid duplicate API calls and benefit from caching.
+        to avoid duplicate API calls and benefit from caching. Lookups go through
+        the in-process cache, then Redis or the disk cache (when configured), then YouTube.
+        Concurrent misses for the same video and languages are coalesced into
+        a single load.
         
         Args:
             video_id: YouTube video ID
             languages: List of language codes (e.g., ["en", "es"])
+            any_language: Fall back to any available transcript when none of
+                *languages* exists (cached separately from regular fetches)
             
         Returns:
-            List of transcript snippets
+            Transcript snippets (iterable; texts also available as ``.texts``)
             
         Raises:
             HTTPException: If transcript cannot be fetched
         """
-        cache = get_cache()
-        normalized_languages = languages or ["en"]
+        normalized_languages = languages or DEFAULT_LANGUAGES
+        cache_languages = _cache_languages(normalized_languages, any_language)
         
         # Try to get from cache first
-        cached_transcript = cache.get(video_id, normalized_languages)
+        cached_transcript = cache.get(video_id, cache_languages)
         if cached_transcript is not None:
+            if isinstance(cached_transcript, CachedError):
+                # Recently failed - answer without asking YouTube again
+                raise HTTPException(status_code=cached_transcript.status_code, detail=cached_transcript.detail)
             return cached_transcript
         
-        # Cache miss - fetch from API
-        try:
-            api = YouTubeTools._get_youtube_api()
-            
-            # Run blocking API call in a thread pool
-            loop = asyncio.get_running_loop()
-            transcript = await loop.run_in_executor(
-                None, 
-                lambda: api.fetch(video_id, languages=normalized_languages)
+        key = (video_id, tuple(cache_languages))
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                YouTubeTools._load_transcript(video_id, normalized_languages, any_language)
             )
+            _inflight[key] = task
             
-            # Store in cache
-            cache.set(video_id, transcript, normalized_languages)
+            def _done(finished: "asyncio.Task[CompactTranscript]") -> None:
+                _inflight.pop(key, None)
+                if not finished.cancelled():
+                    finished.exception()  # Mark retrieved even if every waiter went away
             
+            task.add_done_callback(_done)
+        
+        # Shielded so one client disconnecting doesn't cancel the load for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _load_transcript(
+        video_id: str, normalized_languages: Sequence[str], any_language: bool = False
+    ) -> CompactTranscript:
+        """Load a transcript missing from the in-process cache (second-level cache, then YouTube)."""
+        cache_languages = _cache_languages(normalized_languages, any_language)
+        cached_transcript = await _transcript_l2.get_transcript(video_id, cache_languages)
+        if cached_transcript is not None:
+            transcript = CompactTranscript(cached_transcript)
+            cache.set(video_id, transcript, cache_languages)
             return transcript
+        
+        # Cache miss - fetch from API
+        try:
+            # Run blocking API call in the bounded transcript thread pool, with
+            # that worker thread's own API client
+            loop = asyncio.get_running_loop()
+            fetched = await loop.run_in_executor(
+                get_transcript_executor(),
+                lambda: (
+                    YouTubeTools._fetch_any_language(video_id, normalized_languages)
+                    if any_language
+                    else YouTubeTools._get_youtube_api().fetch(video_id, languages=normalized_languages)
+                )
+            )
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error getting captions for video: {str(e)}")
+            detail = f"Error getting captions for video: {str(e)}"
+            ttl_seconds = _negative_ttl(e)
+            if ttl_seconds > 0:
+                cache.set(video_id, CachedError(500, detail), cache_languages, ttl_seconds=ttl_seconds)
+            raise HTTPException(status_code=500, detail=detail)
+        
+        # The library's snippets are per-instance-dict dataclasses; cache them
+        # column-wise instead (iteration still yields text/start/duration snippets)
+        transcript = CompactTranscript(fetched)
+        
+        # Store in both cache levels
+        cache.set(video_id, transcript, cache_languages)
+        await _transcript_l2.set_transcript(video_id, transcript, cache_languages)
+        
+        return transcript
+
+    @staticmethod
+    async def clear_transcript_cache() -> None:
+        """Clear cached transcripts from the in-process and second-level caches."""
+        cache.clear()
+        await _transcript_l2.clear_transcripts()
 
     @staticmethod
     def get_youtube_video_id(url_or_id: str) -> Optional[str]:
         """Extract a YouTube video ID from either a full URL *or* a raw video ID.
 
-        This helper now supports three input formats so that the API is more
+        This helper supports the following input formats so that the API is
         forgiving when used from the interactive docs:
 
         1. Full YouTube watch URLs – e.g. ``https://www.youtube.com/watch?v=dQw4w9WgXcQ``
+           (``www.``, ``m.`` or no subdomain, optional scheme and port, any letter
+           case; ``v`` may appear anywhere in the query)
         2. Shortened URLs – e.g. ``https://youtu.be/dQw4w9WgXcQ``
-        3. A plain 11-character video ID – e.g. ``dQw4w9WgXcQ``
-        """
-
-        # First, handle the case where the user passed the plain 11-character ID.
-        allowed_chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
-        if len(url_or_id) == 11 and all(ch in allowed_chars for ch in url_or_id):
-            return url_or_id
+        3. Embed URLs – e.g. ``https://www.youtube.com/embed/dQw4w9WgXcQ`` (or ``/v/``)
+        4. A plain 11-character video ID – e.g. ``dQw4w9WgXcQ``
 
-        # Otherwise, attempt to parse as a URL.
-        parsed_url = urlparse(url_or_id)
-        hostname = parsed_url.hostname
-
-        if hostname == "youtu.be":
-            return parsed_url.path.lstrip("/") or None
-
-        if hostname in ("www.youtube.com", "youtube.com"):
-            if parsed_url.path == "/watch":
-                query_params = parse_qs(parsed_url.query)
-                return query_params.get("v", [None])[0]
-            if parsed_url.path.startswith("/embed/"):
-                return parsed_url.path.split("/")[2]
-            if parsed_url.path.startswith("/v/"):
-                return parsed_url.path.split("/")[2]
-
-        return None
+        All forms are matched by a single precompiled regular expression and
+        results are memoized; the returned ID is interned. Empty or oversized
+        inputs are rejected before the memo so they can't crowd it out.
+        """
+        if not url_or_id or len(url_or_id) > _MAX_INPUT_LENGTH:
+            return None
+        return _extract_video_id(url_or_id)
 
     @staticmethod
     async def get_video_data(url: str) -> dict:
@@ -128,15 +370,36 @@ class YouTubeTools:
         except Exception:
             raise HTTPException(status_code=400, detail="Error getting video ID from URL")
 
+        cached = await redis_cache.get_oembed(video_id)
+        if cached is not None and cached.get("fresh"):
+            return cached["body"]
+
+        # A stale cached copy is revalidated with a conditional request
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
         try:
             params = {"format": "json", "url": f"https://www.youtube.com/watch?v={video_id}"}
             oembed_url = "https://www.youtube.com/oembed"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(oembed_url, params=params)
-                response.raise_for_status()
-                video_data = response.json()
-                
+            response = await get_http_client().get(oembed_url, params=params, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                # Not modified - keep the cached body, skip download and parse
+                await redis_cache.set_oembed(
+                    video_id,
+                    cached["body"],
+                    response.headers.get("ETag") or cached.get("etag"),
+                    response.headers.get("Last-Modified") or cached.get("last_modified"),
+                )
+                return cached["body"]
+            response.raise_for_status()
+            # Parse the raw bytes in C, skipping httpx's decode-then-json.loads
+            video_data = orjson.loads(response.content)
+            
             clean_data = {
                 "title": video_data.get("title"),
                 "author_name": video_data.get("author_name"),
@@ -149,15 +412,28 @@ class YouTubeTools:
                 "provider_url": video_data.get("provider_url"),
                 "thumbnail_url": video_data.get("thumbnail_url"),
             }
-            return clean_data
         except Exception as e:
+            # YouTube unreachable or failing: a stale copy beats an error. A 4xx
+            # (e.g. the video was removed or made private) is passed on instead.
+            client_error = isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+            if cached is not None and not client_error:
+                return cached["body"]
             raise HTTPException(status_code=500, detail=f"Error getting video data: {str(e)}")
 
+        await redis_cache.set_oembed(
+            video_id, clean_data, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return clean_data
+
     @staticmethod
-    async def get_video_captions(url_or_id: str, languages: Optional[List[str]] = None) -> str:
+    async def get_video_captions(
+        url_or_id: str, languages: Optional[Sequence[str]] = None, any_language: bool = False
+    ) -> str:
         """Return plain-text captions for the requested YouTube video.
 
         If *languages* is omitted, English (``["en"]``) will be used by default.
+        With *any_language*, a video that has none of the requested languages
+        returns whichever transcript it does have instead of an error.
         """
 
         if not url_or_id:
@@ -167,14 +443,49 @@ class YouTubeTools:
         if not video_id:
             raise HTTPException(status_code=400, detail="Invalid YouTube URL/ID")
 
-        transcript = await YouTubeTools._fetch_transcript(video_id, languages)
+        transcript = await YouTubeTools._fetch_transcript(video_id, languages, any_language)
         
         if transcript:
-            return " ".join(snippet.text for snippet in transcript)
+            # texts is already a tuple, so str.join uses its exact-size fast path
+            return " ".join(transcript.texts)
         return "No captions found for video"
 
     @staticmethod
-    async def get_video_timestamps(url_or_id: str, languages: Optional[List[str]] = None) -> List[str]:
+    async def get_video_captions_bulk(
+        urls_or_ids: Sequence[str], languages: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Return plain-text captions for several videos, fetched concurrently.
+
+        Results are keyed by the input URL/ID, so total latency is close to the
+        slowest single fetch rather than the sum. A video that fails with an
+        HTTP error is reported as ``{"error": detail}`` instead of failing the
+        whole batch.
+        """
+        return await YouTubeTools._gather_bulk(YouTubeTools.get_video_captions, urls_or_ids, languages)
+
+    @staticmethod
+    async def _gather_bulk(
+        fetch: Callable[..., Awaitable[Any]], urls_or_ids: Sequence[str], languages: Optional[Sequence[str]]
+    ) -> Dict[str, Any]:
+        """Run *fetch* for each distinct video concurrently, keyed by input URL/ID."""
+        unique = list(dict.fromkeys(urls_or_ids))
+        results = await asyncio.gather(
+            *(fetch(video, languages) for video in unique),
+            return_exceptions=True,
+        )
+
+        collected: Dict[str, Any] = {}
+        for video, result in zip(unique, results):
+            if isinstance(result, HTTPException):
+                collected[video] = {"error": result.detail}
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                collected[video] = result
+        return collected
+
+    @staticmethod
+    async def get_video_timestamps(url_or_id: str, languages: Optional[Sequence[str]] = None) -> List[str]:
         """Return caption lines prefixed with the *start* timestamp.
 
         The function now mirrors :py:meth:`get_video_captions` and accepts either
@@ -191,9 +502,16 @@ class YouTubeTools:
 
         transcript = await YouTubeTools._fetch_transcript(video_id, languages)
         
-        timestamps: List[str] = []
-        for snippet in transcript:
-            start = int(snippet.start)
-            minutes, seconds = divmod(start, 60)
-            timestamps.append(f"{minutes}:{seconds:02d} - {snippet.text}")
-        return timestamps
\ No newline at end of file
+        return _format_timestamps(transcript)
+
+    @staticmethod
+    async def get_video_timestamps_bulk(
+        urls_or_ids: Sequence[str], languages: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Return timestamped caption lines for several videos, fetched concurrently.
+
+        Same behaviour as :py:meth:`get_video_captions_bulk`. Formatting stays
+        in-process: it is a single C-level %-format per line, and shipping the
+        resulting strings back from a worker process would cost about as much.
+        """
+        return await YouTubeTools._gather_bulk(YouTubeTools.get_video_timestamps, urls_or_ids, languages)
@@ -0,0 +1,215 @@
+"""
+Unit tests for the transcript fetch path in YouTubeTools.
+
+The YouTube API client is replaced by a stub and the second-level cache is
+disabled, so these run offline. Run with: pytest tests/test_transcript_fetch.py
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from youtube_transcript_api import NoTranscriptFound
+
+from app.utils import transcript_cache, youtube_tools
+from app.utils.transcript_cache import Transcript, cache
+from app.utils.youtube_tools import YouTubeTools
+
+VIDEO_ID = "dQw4w9WgXcQ"
+OTHER_VIDEO_ID = "jNQXAC9IVRw"
+
+
+class FakeListedTranscript:
+    """Entry of a FakeTranscriptList."""
+
+    def __init__(self, language_code):
+        self.language_code = language_code
+
+    def fetch(self):
+        return snippets(self.language_code)
+
+
+class FakeTranscriptList:
+    """Stands in for the library's TranscriptList over *available* language codes."""
+
+    def __init__(self, video_id, available):
+        self.video_id = video_id
+        self.available = available
+
+    def __iter__(self):
+        return iter([FakeListedTranscript(code) for code in self.available])
+
+    def find_transcript(self, language_codes):
+        for code in language_codes:
+            if code in self.available:
+                return FakeListedTranscript(code)
+        raise NoTranscriptFound(self.video_id, language_codes, self.available)
+
+
+class FakeApi:
+    """Stands in for YouTubeTranscriptApi.
+
+    ``fetch`` delegates to *handler*, which returns snippets or raises;
+    ``list`` offers transcripts in the *available* languages.
+    """
+
+    def __init__(self, handler, available=()):
+        self.handler = handler
+        self.available = available
+        self.calls = []
+        self.list_calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, video_id, languages):
+        with self._lock:
+            self.calls.append((video_id, tuple(languages)))
+        return self.handler(video_id, tuple(languages))
+
+    def list(self, video_id):
+        with self._lock:
+            self.list_calls.append(video_id)
+        return FakeTranscriptList(video_id, self.available)
+
+
+class NoSecondLevelCache:
+    """Disabled Redis/disk cache."""
+
+    async def get_transcript(self, video_id, languages):
+        return None
+
+    async def set_transcript(self, video_id, transcript, languages):
+        pass
+
+
+def snippets(text):
+    return [Transcript(text, 0.0, 1.0), Transcript("end", 61.5, 1.0)]
+
+
+@pytest.fixture
+def use_api(monkeypatch):
+    """Install a FakeApi built from a handler; caches start empty."""
+    monkeypatch.setattr(youtube_tools, "_transcript_l2", NoSecondLevelCache())
+    monkeypatch.setattr(cache, "enabled", True)
+    cache.clear()
+
+    def install(handler, available=()):
+        api = FakeApi(handler, available)
+        monkeypatch.setattr(YouTubeTools, "_get_youtube_api", staticmethod(lambda: api))
+        return api
+
+    yield install
+    cache.clear()
+    youtube_tools.shutdown_transcript_executor()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(use_api):
+    def handler(video_id, languages):
+        time.sleep(0.05)  # Keep the load running while the other callers arrive
+        return snippets("hello")
+
+    api = use_api(handler)
+    results = await asyncio.gather(*(YouTubeTools._fetch_transcript(VIDEO_ID) for _ in range(10)))
+
+    assert len(api.calls) == 1
+    assert all(result.texts == ("hello", "end") for result in results)
+    assert youtube_tools._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_cached_until_ttl_expires(use_api, monkeypatch):
+    def handler(video_id, languages):
+        raise RuntimeError("blocked")
+
+    api = use_api(handler)
+    monkeypatch.setattr(youtube_tools, "_negative_ttl", lambda error: 60)
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc_info:
+            await YouTubeTools._fetch_transcript(VIDEO_ID)
+        assert exc_info.value.status_code == 500
+        assert "blocked" in exc_info.value.detail
+    assert len(api.calls) == 1
+
+    class Later:
+        """Clock 61 seconds ahead, used only by the transcript cache."""
+
+        @staticmethod
+        def monotonic():
+            return time.monotonic() + 61
+
+    monkeypatch.setattr(transcript_cache, "time", Later)
+    with pytest.raises(HTTPException):
+        await YouTubeTools._fetch_transcript(VIDEO_ID)
+    assert len(api.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_local_errors_are_not_negative_cached(use_api):
+    api = use_api(lambda video_id, languages: snippets("unused"))
+    assert youtube_tools._negative_ttl(RuntimeError("cannot schedule new futures after shutdown")) == 0
+
+    youtube_tools.shutdown_transcript_executor()
+    youtube_tools.get_transcript_executor().shutdown()  # Fail the next submit
+    with pytest.raises(HTTPException):
+        await YouTubeTools._fetch_transcript(VIDEO_ID)
+    assert cache.size() == 0
+    assert api.calls == []
+
+
+@pytest.mark.asyncio
+async def test_any_language_prefers_requested_order_with_one_list_call(use_api):
+    api = use_api(lambda video_id, languages: snippets("unused"), available=("es", "fr"))
+    text = await YouTubeTools.get_video_captions(VIDEO_ID, ("de", "fr", "es"), any_language=True)
+
+    assert text == "fr end"
+    assert api.list_calls == [VIDEO_ID]
+    assert api.calls == []
+
+
+@pytest.mark.asyncio
+async def test_any_language_falls_back_to_any_transcript(use_api):
+    def handler(video_id, languages):
+        raise RuntimeError(f"no {languages[0]}")
+
+    api = use_api(handler, available=("ja", "ko"))
+    text = await YouTubeTools.get_video_captions(VIDEO_ID, ("de",), any_language=True)
+    assert text == "ja end"
+
+    # The fallback result is cached apart from regular requests for "de"
+    with pytest.raises(HTTPException) as exc_info:
+        await YouTubeTools.get_video_captions(VIDEO_ID, ("de",))
+    assert exc_info.value.detail.endswith("no de")
+    assert len(api.list_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_any_language_fails_when_video_has_no_transcripts(use_api):
+    use_api(lambda video_id, languages: snippets("unused"), available=())
+    with pytest.raises(HTTPException) as exc_info:
+        await YouTubeTools.get_video_captions(VIDEO_ID, ("de", "fr"), any_language=True)
+
+    assert exc_info.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_errors_per_video(use_api):
+    def handler(video_id, languages):
+        if video_id == OTHER_VIDEO_ID:
+            raise RuntimeError("unavailable")
+        return snippets("hello")
+
+    use_api(handler)
+    url = f"https://youtu.be/{VIDEO_ID}"
+    result = await YouTubeTools.get_video_captions_bulk([url, OTHER_VIDEO_ID, "not a video", url])
+
+    assert result == {
+        url: "hello end",
+        OTHER_VIDEO_ID: {"error": "Error getting captions for video: unavailable"},
+        "not a video": {"error": "Invalid YouTube URL/ID"},
+    }
+
+    timestamps = await YouTubeTools.get_video_timestamps_bulk([VIDEO_ID, OTHER_VIDEO_ID])
+    assert timestamps[VIDEO_ID] == ["0:00 - hello", "1:01 - end"]
+    assert "error" in timestamps[OTHER_VIDEO_ID]
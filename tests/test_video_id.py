@@ -0,0 +1,65 @@
+"""
+Unit tests for video ID extraction (YouTubeTools.get_youtube_video_id).
+
+Run with: pytest tests/test_video_id.py
+"""
+import pytest
+
+from app.utils.youtube_tools import YouTubeTools
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url_or_id", [
+    # Forms accepted before the regex rewrite
+    VIDEO_ID,
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtube.com/watch?v={VIDEO_ID}",
+    f"http://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&t=42s",
+    f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?vv=1&av=2&v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}#t=10",
+    f"https://youtu.be/{VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?t=42",
+    f"https://www.youtube.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/v/{VIDEO_ID}",
+    f"https://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}",
+    f"HTTPS://youtu.be/{VIDEO_ID}",
+    f"https://www.youtube.com:443/watch?v={VIDEO_ID}",
+    # Forms added by the rewrite
+    f"https://m.youtube.com/watch?v={VIDEO_ID}",
+    f"youtube.com/watch?v={VIDEO_ID}",
+    f"www.youtube.com/watch?v={VIDEO_ID}",
+    f"youtu.be/{VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}/",
+    f"https://www.youtube.com/embed/{VIDEO_ID}/",
+    # Other query parameters may use any legal URL character
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&ab_channel=Rick(Official)",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&list=PLx~y",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&x=a!b*c'd,e;f@g$h",
+])
+def test_accepted_forms(url_or_id):
+    assert YouTubeTools.get_youtube_video_id(url_or_id) == VIDEO_ID
+
+
+@pytest.mark.parametrize("url_or_id", [
+    "",
+    VIDEO_ID[:10],
+    VIDEO_ID + "Q",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}Q",
+    f"https://youtu.be/{VIDEO_ID}Q",
+    f"https://www.youtube.com/watch?vv={VIDEO_ID}",
+    f"https://example.com/watch?v={VIDEO_ID}",
+    "https://www.youtube.com/watch?list=PL123",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&q=a b",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&q=<script>",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&pad=" + "x" * 256,
+])
+def test_rejected_forms(url_or_id):
+    assert YouTubeTools.get_youtube_video_id(url_or_id) is None
+
+
+def test_first_v_parameter_wins():
+    url = f"https://www.youtube.com/watch?v={VIDEO_ID}&t=5&v=jNQXAC9IVRw"
+    assert YouTubeTools.get_youtube_video_id(url) == VIDEO_ID